@@ -0,0 +1,187 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from . import database, models
+from .config import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_BLOCK_TIMEOUT,
+    AUDIT_FLUSH_INTERVAL,
+    AUDIT_QUEUE_POLICY,
+    AUDIT_QUEUE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLog:
+    """Write-behind buffer for audit events.
+
+    Handlers call ``record`` which only enqueues; a background thread writes
+    batches with a single multi-row insert whenever ``batch_size`` events
+    are waiting or ``flush_interval`` seconds have passed.
+    """
+
+    MAX_RETRY_DELAY = 30.0
+    SHUTDOWN_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        policy: str = AUDIT_QUEUE_POLICY,
+        block_timeout: float = AUDIT_BLOCK_TIMEOUT,
+    ):
+        if policy not in {"drop", "block"}:
+            raise ValueError("Audit queue policy must be 'drop' or 'block'")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._dropped = 0
+        self._failed_flushes = 0
+        # A batch whose write failed is kept here and retried with backoff
+        # before anything newer is written, so a transient error loses nothing.
+        self._retry = []
+        self._retry_at = 0.0
+        self._retry_delay = max(flush_interval, 0.1)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "queued": self._queue.qsize() + len(self._retry),
+                "dropped": self._dropped,
+                "failed_flushes": self._failed_flushes,
+            }
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """Stop the flusher and write out everything still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                # Still inside a write; draining now would race it on the
+                # retry batch and could insert the same events twice.
+                logger.error(
+                    "Audit flusher did not stop within %s seconds, skipping final drain of %s events",
+                    timeout,
+                    self.stats()["queued"],
+                )
+                return
+            self._thread = None
+
+        batch, self._retry = self._retry + self._drain(None), []
+        for attempt in range(self.SHUTDOWN_ATTEMPTS):
+            if self._flush(batch):
+                batch = []
+                break
+            if attempt + 1 < self.SHUTDOWN_ATTEMPTS:
+                time.sleep(min(2 ** attempt, 5))
+
+        if batch:
+            with self._stats_lock:
+                self._dropped += len(batch)
+            logger.error("Could not write %s audit events at shutdown", len(batch))
+        stats = self.stats()
+        logger.info(
+            "Audit log stopped: %s events dropped, %s failed flushes",
+            stats["dropped"],
+            stats["failed_flushes"],
+        )
+
+    def record(self, actor_id, action: str, target_type: str, target_id=None, **details):
+        event = {
+            "actor_id": actor_id,
+            "action": action,
+            "target_type": target_type,
+            "target_id": target_id,
+            "details": details or None,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            if self.policy == "block":
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            logger.warning("Audit queue full, dropped %s event", action)
+
+    def _drain(self, limit):
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        deadline = time.monotonic() + self.flush_interval
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if self._retry:
+                if now < self._retry_at:
+                    self._stop.wait(min(self._retry_at - now, 0.1))
+                elif self._flush(self._retry):
+                    self._retry = []
+                    self._retry_delay = max(self.flush_interval, 0.1)
+                else:
+                    self._schedule_retry()
+                continue
+
+            if self._queue.qsize() < self.batch_size and deadline - now > 0:
+                self._stop.wait(min(deadline - now, 0.1))
+                continue
+
+            batch = self._drain(self.batch_size)
+            if not self._flush(batch):
+                self._retry = batch
+                self._schedule_retry()
+            if self._queue.qsize() < self.batch_size:
+                deadline = time.monotonic() + self.flush_interval
+
+    def _schedule_retry(self):
+        self._retry_at = time.monotonic() + self._retry_delay
+        self._retry_delay = min(self._retry_delay * 2, self.MAX_RETRY_DELAY)
+
+    def _flush(self, batch):
+        if not batch:
+            return True
+        try:
+            self._write(batch)
+        except Exception:
+            with self._stats_lock:
+                self._failed_flushes += 1
+            logger.exception("Failed to write %s audit events", len(batch))
+            return False
+        return True
+
+    def _write(self, batch):
+        with database.engine.begin() as connection:
+            connection.execute(insert(models.AuditEvent), batch)
+
+
+audit_log = AuditLog()
+
+
+def record_audit(actor_id, action: str, target_type: str, target_id=None, **details):
+    audit_log.record(actor_id, action, target_type, target_id, **details)
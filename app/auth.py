@@ -1,13 +1,12 @@
-import os
 from datetime import datetime, timedelta
 
-from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from . import database, models
+from .config import SECRET_KEY
 
 try:
     from jose import JWTError, jwt
@@ -15,9 +14,6 @@ except ModuleNotFoundError:
     import jwt
     from jwt.exceptions import PyJWTError as JWTError
 
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY", "change-this-secret")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
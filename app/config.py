@@ -0,0 +1,23 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+SECRET_KEY = os.getenv("SECRET_KEY", "change-this-secret")
+DB_POOL_MIN_CONNECTIONS = int(os.getenv("DB_POOL_MIN_CONNECTIONS", "2"))
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "2"))
+# "drop" discards events when the queue is full, "block" makes the handler wait.
+AUDIT_QUEUE_POLICY = os.getenv("AUDIT_QUEUE_POLICY", "drop").lower()
+# Longest a handler waits for queue space under the "block" policy before the
+# event is dropped, so a stalled flusher cannot tie up the threadpool.
+AUDIT_BLOCK_TIMEOUT = float(os.getenv("AUDIT_BLOCK_TIMEOUT", "1"))
+
+# Number of reverse proxies in front of the app that append to X-Forwarded-For.
+# 0 means clients connect directly and request.client.host is used; behind a
+# proxy set this, otherwise every user shares the proxy's rate-limit bucket.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
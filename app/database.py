@@ -1,13 +1,8 @@
-import os
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
 
-load_dotenv()
-
-# DATABASE_URL = os.getenv("DATABASE_URL")
-DATABASE_URL  = os.getenv("DATABASE_URL")
+from .config import DATABASE_URL, DB_POOL_MIN_CONNECTIONS
 
 engine = create_engine(DATABASE_URL)
 
@@ -24,4 +19,15 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def prewarm_pool(size: int = DB_POOL_MIN_CONNECTIONS):
+    """Open ``size`` pooled connections up front so early requests reuse them."""
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
@@ -1,12 +1,87 @@
-from fastapi import FastAPI
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from .routes import auth_routes, page_routes, admin_routes, user_routes, library_routes
-from .database import engine, Base
-from . import models
+from .audit import audit_log
+from .startup import warm_up
+
+logger = logging.getLogger(__name__)
+
+
+WARMUP_INITIAL_DELAY = 1.0
+WARMUP_MAX_DELAY = 30.0
+
+
+async def _run_warm_up(app: FastAPI):
+    # The database may come up after the app, and cold workers race each
+    # other on create_all, so a failed attempt is retried rather than
+    # leaving the worker unready until it is restarted.
+    delay = WARMUP_INITIAL_DELAY
+    while True:
+        try:
+            await asyncio.to_thread(warm_up)
+        except Exception as exc:
+            logger.exception("Warmup failed, retrying in %.0f seconds", delay)
+            app.state.warmup_error = str(exc)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARMUP_MAX_DELAY)
+            continue
+        app.state.warmup_error = None
+        app.state.ready = True
+        # Events recorded before this point wait in the queue until the
+        # audit table is known to exist.
+        audit_log.start()
+        return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.warmup_error = None
+    warmup_task = asyncio.create_task(_run_warm_up(app))
+    yield
+    warmup_task.cancel()
+    await asyncio.to_thread(audit_log.stop)
+
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def add_json_etag(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or response.headers.get("content-type") != "application/json"
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = dict(response.headers)
+    headers.pop("content-length", None)
+    headers["ETag"] = etag
+    headers["Cache-Control"] = "private, no-cache"
+    headers["Vary"] = "Authorization"
 
-models.Base.metadata.create_all(bind=engine)
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={key: headers[key] for key in ("ETag", "Cache-Control", "Vary")})
+    return Response(content=body, status_code=200, headers=headers)
 
-app = FastAPI()
+@app.get("/ready", include_in_schema=False)
+def readiness(request: Request):
+    if request.app.state.ready:
+        return {"status": "ready"}
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "warming_up", "error": request.app.state.warmup_error},
+        headers={"Cache-Control": "no-store"},
+    )
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
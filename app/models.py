@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Index, Integer, String
 from .database import Base
 
 class User(Base):
@@ -16,6 +16,14 @@ class User(Base):
     profile_image = Column(String, nullable=True)
 
 
+class StoredFile(Base):
+    __tablename__ = "stored_files"
+
+    key = Column(String, primary_key=True)
+    ref_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class Library(Base):
     __tablename__ = "libraries"
 
@@ -40,3 +48,35 @@ class Task(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+
+class TaskAssigneeStat(Base):
+    __tablename__ = "task_assignee_stats"
+
+    assigned_to = Column(Integer, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+
+class TaskDailyStat(Base):
+    __tablename__ = "task_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_target", "target_type", "target_id", "id"),
+        Index("ix_audit_events_actor", "actor_id", "id"),
+        Index("ix_audit_events_action", "action", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    actor_id = Column(Integer, nullable=True)
+    action = Column(String, nullable=False)
+    target_type = Column(String, nullable=False)
+    target_id = Column(Integer, nullable=True)
+    details = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
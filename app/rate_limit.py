@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from fastapi import HTTPException, Request, status
+
+from .config import TRUSTED_PROXY_HOPS
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: int
+    period: float
+
+    @property
+    def refill_rate(self):
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str):
+        capacity, period = value.split("/", 1)
+        return cls(int(capacity), float(period))
+
+
+# Defaults per route and scope, written as "<attempts>/<seconds>".
+# Override with e.g. RATE_LIMIT_LOGIN_IP=20/60 or RATE_LIMIT_SIGNUP_EMAIL=off.
+DEFAULT_LIMITS = {
+    "login": {"ip": "20/60", "email": "5/60"},
+    "signup": {"ip": "5/300", "email": "3/300"},
+}
+
+
+def _load_limits():
+    limits = {}
+    for route, scopes in DEFAULT_LIMITS.items():
+        limits[route] = {}
+        for scope, default in scopes.items():
+            value = os.getenv(f"RATE_LIMIT_{route.upper()}_{scope.upper()}", default).strip()
+            if value.lower() != "off":
+                limits[route][scope] = Limit.parse(value)
+    return limits
+
+
+class InMemoryBackend:
+    """Token buckets local to this process.
+
+    Buckets are kept in least-recently-updated order. A bucket idle for the
+    longest configured period has refilled completely and is equivalent to a
+    missing one, so idle buckets are popped off the front as they expire,
+    which costs O(1) amortized per call. ``MAX_BUCKETS`` bounds memory when
+    many keys are active at once by evicting the least recently used.
+    """
+
+    MAX_BUCKETS = 100_000
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._throttled = Counter()
+        self._horizon = max(
+            (limit.period for scopes in get_limits().values() for limit in scopes.values()),
+            default=0,
+        )
+
+    def take(self, key: str, limit: Limit):
+        """Take one token; returns seconds to wait, or 0 when allowed."""
+        now = time.monotonic()
+        with self._lock:
+            self._horizon = max(self._horizon, limit.period)
+            tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._prune(now)
+
+        if allowed:
+            return 0
+        return (1 - tokens) / limit.refill_rate
+
+    def _prune(self, now: float):
+        buckets = self._buckets
+        while buckets:
+            _, (_, updated) = next(iter(buckets.items()))
+            if now - updated < self._horizon and len(buckets) <= self.MAX_BUCKETS:
+                break
+            buckets.popitem(last=False)
+
+    def record_throttle(self, route: str, scope: str):
+        with self._lock:
+            self._throttled[(route, scope)] += 1
+
+    def throttled_counts(self):
+        with self._lock:
+            return dict(self._throttled)
+
+
+class RedisBackend:
+    """Token buckets and throttle counters shared by every worker through Redis."""
+
+    THROTTLED_KEY = "rate_limit:throttled"
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], ttl)
+return tostring(wait)
+"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ModuleNotFoundError as exc:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the redis package") from exc
+
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def take(self, key: str, limit: Limit):
+        wait = self._script(
+            keys=[f"rate_limit:{key}"],
+            args=[limit.capacity, limit.refill_rate, time.time(), int(limit.period) + 1],
+        )
+        return float(wait)
+
+    def record_throttle(self, route: str, scope: str):
+        self._client.hincrby(self.THROTTLED_KEY, f"{route}:{scope}", 1)
+
+    def throttled_counts(self):
+        counts = {}
+        for field, count in self._client.hgetall(self.THROTTLED_KEY).items():
+            route, scope = field.decode().split(":", 1)
+            counts[(route, scope)] = int(count)
+        return counts
+
+
+@lru_cache
+def get_limits():
+    return _load_limits()
+
+
+@lru_cache
+def get_backend():
+    if os.getenv("RATE_LIMIT_BACKEND", "memory").lower() == "redis":
+        return RedisBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return InMemoryBackend()
+
+
+def throttled_counts():
+    return [
+        {"route": route, "scope": scope, "count": count}
+        for (route, scope), count in sorted(get_backend().throttled_counts().items())
+    ]
+
+
+def client_ip(request: Request, trusted_hops: int = TRUSTED_PROXY_HOPS):
+    """The address of the client, looking past ``trusted_hops`` proxies.
+
+    Each trusted proxy appends the address it saw to X-Forwarded-For, so the
+    entry ``trusted_hops`` from the end is the first one not added by a
+    client; anything further left can be forged.
+    """
+    if trusted_hops > 0:
+        forwarded = [
+            value.strip()
+            for value in request.headers.get("x-forwarded-for", "").split(",")
+            if value.strip()
+        ]
+        if forwarded:
+            return forwarded[-min(trusted_hops, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+
+def check_rate_limit(request: Request, route: str, email: str | None = None):
+    """Raise 429 if this client or email is over the route's limit.
+
+    Call this before any database query or password hash so rejected
+    attempts cost next to nothing.
+    """
+    scopes = get_limits().get(route, {})
+    identities = {
+        "ip": client_ip(request),
+        "email": email.strip().lower() if email else None,
+    }
+
+    backend = get_backend()
+    for scope, limit in scopes.items():
+        identity = identities.get(scope)
+        if identity is None:
+            continue
+        wait = backend.take(f"{route}:{scope}:{identity}", limit)
+        if wait > 0:
+            backend.record_throttle(route, scope)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please try again later.",
+                headers={"Retry-After": str(max(1, int(wait + 0.999)))},
+            )
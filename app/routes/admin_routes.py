@@ -1,10 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+import re
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, aliased
 from .. import models, schemas, database
+from ..audit import audit_log, record_audit
 from ..auth import get_current_admin
+from ..rate_limit import throttled_counts
+from ..task_stats import ensure_task_stats, record_task_status_change
 
 router  = APIRouter(prefix = "/admin", tags = ["Admin"])
 ALLOWED_TASK_STATUSES = {"pending", "not_completed", "completed"}
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+EXPORT_BATCH_SIZE = 500
+USER_EXPORT_FIELDS = ["id", "name", "email", "phone", "role", "level", "profile_image"]
+TASK_EXPORT_FIELDS = [
+    "id", "title", "description", "status", "assigned_to", "assigned_to_name",
+    "assigned_by", "assigned_by_name", "is_new", "created_at", "updated_at",
+]
+# Phone numbers and other plain numbers; a leading + or - here is not a formula.
+PLAIN_NUMBER_PATTERN = re.compile(r"^[+-]?[\d\s().-]+$")
 
 
 def _task_to_response(task: models.Task, db: Session):
@@ -24,6 +44,110 @@ def _task_to_response(task: models.Task, db: Session):
         "updated_at": task.updated_at,
     }
 
+def _users_export_query(db: Session, query: str | None):
+    users = db.query(
+        *(getattr(models.User, field) for field in USER_EXPORT_FIELDS)
+    ).order_by(models.User.id.asc())
+    if query:
+        users = users.filter(models.User.name.ilike(f"%{query}%"))
+    return users
+
+
+def _tasks_export_query(db: Session, query: str | None):
+    assignee = aliased(models.User)
+    assigner = aliased(models.User)
+    tasks = (
+        db.query(
+            models.Task.id,
+            models.Task.title,
+            models.Task.description,
+            models.Task.status,
+            models.Task.assigned_to,
+            assignee.name.label("assigned_to_name"),
+            models.Task.assigned_by,
+            assigner.name.label("assigned_by_name"),
+            models.Task.is_new,
+            models.Task.created_at,
+            models.Task.updated_at,
+        )
+        .outerjoin(assignee, assignee.id == models.Task.assigned_to)
+        .outerjoin(assigner, assigner.id == models.Task.assigned_by)
+        .order_by(models.Task.created_at.desc())
+    )
+    if query and query.strip():
+        # Plain substring match like get_admin_tasks, so LIKE wildcards are escaped.
+        escaped = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        needle = f"%{escaped}%"
+        tasks = tasks.filter(
+            or_(
+                models.Task.title.ilike(needle, escape="\\"),
+                models.Task.description.ilike(needle, escape="\\"),
+                assignee.name.ilike(needle, escape="\\"),
+            )
+        )
+    return tasks
+
+
+def _json_export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_export_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Spreadsheets evaluate cells starting with these characters as formulas.
+    if (
+        isinstance(value, str)
+        and value.startswith(("=", "+", "-", "@", "\t", "\r"))
+        and not PLAIN_NUMBER_PATTERN.match(value)
+    ):
+        return "'" + value
+    return value
+
+
+def _stream_export(build_query, query: str | None, fields: list[str], export_format: str):
+    # The request-scoped session may be closed before the body is sent, so the
+    # generator owns its own session for the lifetime of the server-side cursor.
+    db = database.SessionLocal()
+    try:
+        rows = build_query(db, query).yield_per(EXPORT_BATCH_SIZE)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(fields)
+
+        for index, row in enumerate(rows, start=1):
+            if export_format == "csv":
+                writer.writerow([_csv_export_value(value) for value in row])
+            else:
+                buffer.write(json.dumps({field: _json_export_value(value) for field, value in zip(fields, row)}))
+                buffer.write("\n")
+
+            if index % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def _export_response(build_query, query: str | None, fields: list[str], export_format: str, name: str):
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format. Use csv or ndjson.")
+
+    return StreamingResponse(
+        _stream_export(build_query, query, fields, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
 @router.get("/users", response_model = list[schemas.AdminUserResponse])
 def get_all_users(db:Session = Depends(database.get_db), current_admin: models.User = Depends(get_current_admin)):
     users  = db.query(models.User).all()
@@ -35,6 +159,10 @@ def search_users(query: str, db: Session = Depends(database.get_db), current_adm
 
     return users
 
+@router.get("/export/users")
+def export_users(query: str | None = None, format: str = "csv", current_admin: models.User = Depends(get_current_admin)):
+    return _export_response(_users_export_query, query, USER_EXPORT_FIELDS, format, "users")
+
 @router.put("/users/{user_id}", response_model = schemas.AdminUserResponse)
 def update_user(user_id: int, update_data: schemas.AdminUserUpdate, db: Session = Depends(database.get_db), current_admin: models.User = Depends(get_current_admin)):
     user  = db.query(models.User).filter(models.User.id == user_id).first()
@@ -42,14 +170,21 @@ def update_user(user_id: int, update_data: schemas.AdminUserUpdate, db: Session
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+    changes = {}
     if update_data.level is not None:
+        if update_data.level != user.level:
+            changes["level"] = {"old": user.level, "new": update_data.level}
         user.level = update_data.level
 
     if update_data.role is not None:
+        if update_data.role != user.role:
+            changes["role"] = {"old": user.role, "new": update_data.role}
         user.role = update_data.role
 
     db.commit()
     db.refresh(user)
+    if changes:
+        record_audit(current_admin.id, "user.update", "user", user.id, changes=changes)
 
     return user
 
@@ -80,8 +215,14 @@ def assign_task(
         is_new=True,
     )
     db.add(task)
+    db.flush()
+    record_task_status_change(db, task, None)
     db.commit()
     db.refresh(task)
+    record_audit(
+        current_admin.id, "task.assign", "task", task.id,
+        title=task.title, assigned_to=task.assigned_to, status=task.status,
+    )
     return _task_to_response(task, db)
 
 
@@ -108,6 +249,67 @@ def get_admin_tasks(
     return filtered
 
 
+@router.get("/export/tasks")
+def export_tasks(
+    query: str | None = None,
+    format: str = "csv",
+    current_admin: models.User = Depends(get_current_admin),
+):
+    return _export_response(_tasks_export_query, query, TASK_EXPORT_FIELDS, format, "tasks")
+
+
+@router.get("/tasks/stats", response_model=schemas.TaskStatsResponse)
+def get_task_stats(
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin),
+):
+    if ensure_task_stats(db):
+        db.commit()
+
+    by_status = {task_status: 0 for task_status in ALLOWED_TASK_STATUSES}
+    by_assignee = {}
+    for row in db.query(models.TaskAssigneeStat).filter(models.TaskAssigneeStat.count > 0).all():
+        entry = by_assignee.setdefault(row.assigned_to, {"assigned_to": row.assigned_to, "total": 0})
+        entry[row.status] = entry.get(row.status, 0) + row.count
+        entry["total"] += row.count
+        by_status[row.status] = by_status.get(row.status, 0) + row.count
+
+    names = dict(
+        db.query(models.User.id, models.User.name)
+        .filter(models.User.id.in_(list(by_assignee)))
+        .all()
+    ) if by_assignee else {}
+    for assigned_to, entry in by_assignee.items():
+        entry["assigned_to_name"] = names.get(assigned_to)
+
+    timeline = {}
+    daily_rows = (
+        db.query(models.TaskDailyStat)
+        .filter(models.TaskDailyStat.count > 0)
+        .order_by(models.TaskDailyStat.day.asc())
+        .all()
+    )
+    for row in daily_rows:
+        point = timeline.setdefault(row.day, {"day": row.day, "total": 0, "completed": 0})
+        point["total"] += row.count
+        if row.status == "completed":
+            point["completed"] += row.count
+    for point in timeline.values():
+        point["completion_rate"] = point["completed"] / point["total"] if point["total"] else 0.0
+
+    total = sum(by_status.values())
+    return {
+        "total": total,
+        "pending_total": by_status.get("pending", 0),
+        "overdue_total": by_status.get("not_completed", 0),
+        "completed_total": by_status.get("completed", 0),
+        "completion_rate": by_status.get("completed", 0) / total if total else 0.0,
+        "by_status": by_status,
+        "by_assignee": sorted(by_assignee.values(), key=lambda entry: entry["total"], reverse=True),
+        "completion_over_time": list(timeline.values()),
+    }
+
+
 @router.patch("/tasks/{task_id}", response_model=schemas.TaskResponse)
 def update_task_status(
     task_id: int,
@@ -126,7 +328,72 @@ def update_task_status(
             detail="Invalid status. Use pending, not_completed, or completed.",
         )
 
+    old_status = task.status
     task.status = normalized_status
+    db.flush()
+    record_task_status_change(db, task, old_status)
     db.commit()
     db.refresh(task)
+    if old_status != task.status:
+        record_audit(
+            current_admin.id, "task.status_change", "task", task.id,
+            old=old_status, new=task.status,
+        )
     return _task_to_response(task, db)
+
+
+@router.get("/rate-limits", response_model=list[schemas.ThrottledCount])
+def get_rate_limit_stats(current_admin: models.User = Depends(get_current_admin)):
+    return throttled_counts()
+
+
+@router.get("/audit-log/stats", response_model=schemas.AuditLogStats)
+def get_audit_log_stats(current_admin: models.User = Depends(get_current_admin)):
+    return audit_log.stats()
+
+
+@router.get("/audit-log", response_model=schemas.AuditLogPage)
+def get_audit_log(
+    before_id: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    actor_id: int | None = None,
+    action: str | None = None,
+    target_type: str | None = None,
+    target_id: int | None = None,
+    db: Session = Depends(database.get_db),
+    current_admin: models.User = Depends(get_current_admin),
+):
+    # Keyset pagination on id so every page is an index range scan, newest first.
+    events = (
+        db.query(models.AuditEvent, models.User.name)
+        .outerjoin(models.User, models.User.id == models.AuditEvent.actor_id)
+    )
+    if before_id is not None:
+        events = events.filter(models.AuditEvent.id < before_id)
+    if actor_id is not None:
+        events = events.filter(models.AuditEvent.actor_id == actor_id)
+    if action:
+        events = events.filter(models.AuditEvent.action == action)
+    if target_type:
+        events = events.filter(models.AuditEvent.target_type == target_type)
+    if target_id is not None:
+        events = events.filter(models.AuditEvent.target_id == target_id)
+
+    rows = events.order_by(models.AuditEvent.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    return {
+        "events": [
+            {
+                "id": event.id,
+                "actor_id": event.actor_id,
+                "actor_name": actor_name,
+                "action": event.action,
+                "target_type": event.target_type,
+                "target_id": event.target_id,
+                "details": event.details,
+                "created_at": event.created_at,
+            }
+            for event, actor_name in page
+        ],
+        "next_before_id": page[-1][0].id if len(rows) > limit else None,
+    }
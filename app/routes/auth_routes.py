@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from .. import models, schemas, database
 from ..auth import get_password_hash, verify_password, create_access_token
+from ..rate_limit import check_rate_limit
 
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/signup", response_model = schemas.UserResponse) 
-def signup(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
+def signup(user: schemas.UserCreate, request: Request, db: Session = Depends(database.get_db)):
+    check_rate_limit(request, "signup", email=user.email)
     existing_user = db.query(models.User).filter(models.User.email == user.email).first()
 
     if existing_user:
@@ -38,7 +40,8 @@ def signup(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
     return new_user
 
 @router.post("/login")
-def login(user: schemas.UserLogin, db: Session = Depends(database.get_db)):
+def login(user: schemas.UserLogin, request: Request, db: Session = Depends(database.get_db)):
+    check_rate_limit(request, "login", email=user.email)
     db_user = db.query(models.User).filter(models.User.email == user.email).first()
 
     if not db_user or not verify_password(user.password, db_user.hashed_password):
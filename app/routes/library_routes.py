@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from sqlalchemy.orm import Session
 from .. import models, schemas, database
+from ..audit import record_audit
 from ..auth import get_current_admin
 
 router = APIRouter(prefix = "/libraries", tags=["Libraries"])
@@ -24,6 +25,7 @@ def create_library(library_data: schemas.LibraryCreate, db: Session = Depends(da
     db.add(new_library)
     db.commit()
     db.refresh(new_library)
+    record_audit(current_admin.id, "library.create", "library", new_library.id, title=new_library.title)
 
     return new_library
 
@@ -34,12 +36,20 @@ def update_library(library_id: int, updated_data: schemas.LibraryCreate, db: Ses
     if not library:
         raise HTTPException(status_code=404, detail="Library not found")
 
+    before = {"title": library.title, "drive_link": library.drive_link, "preview_link": library.preview_link}
     library.title  = updated_data.title
     library.drive_link = updated_data.drive_link
     library.preview_link = (updated_data.preview_link or "").strip() or DEFAULT_PREVIEW
 
     db.commit()
     db.refresh(library)
+    changes = {
+        field: {"old": old_value, "new": getattr(library, field)}
+        for field, old_value in before.items()
+        if getattr(library, field) != old_value
+    }
+    if changes:
+        record_audit(current_admin.id, "library.update", "library", library.id, changes=changes)
 
     return library
 
@@ -51,7 +61,9 @@ def delete_library(library_id: int, db: Session = Depends(database.get_db), curr
     if not library:
         raise HTTPException(status_code=404, detail= "Library not found")
 
+    title = library.title
     db.delete(library)
     db.commit()
+    record_audit(current_admin.id, "library.delete", "library", library_id, title=title)
 
     return {"message": "Library deleted successfully"}
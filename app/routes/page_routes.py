@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
+from functools import lru_cache
+import hashlib
 import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -48,3 +50,33 @@ def profile_page(request: Request):
 @router.get("/tasks", response_class=HTMLResponse)
 def tasks_page(request: Request):
     return templates.TemplateResponse("tasks.html", {"request": request})
+
+
+@lru_cache
+def _service_worker_source():
+    # The worker caches pages as well as CSS and JS, so templates are part
+    # of the version too.
+    static_dir = os.path.join(BASE_DIR, "static")
+    digest = hashlib.sha256()
+    for folder_path in (
+        os.path.join(static_dir, "css"),
+        os.path.join(static_dir, "js"),
+        os.path.join(BASE_DIR, "templates"),
+    ):
+        for name in sorted(os.listdir(folder_path)):
+            with open(os.path.join(folder_path, name), "rb") as asset:
+                digest.update(name.encode())
+                digest.update(asset.read())
+
+    with open(os.path.join(static_dir, "js", "sw.js"), encoding="utf-8") as worker:
+        return worker.read().replace("__CACHE_VERSION__", digest.hexdigest()[:12])
+
+
+@router.get("/sw.js", include_in_schema=False)
+def service_worker():
+    # Served from the site root so the worker's scope covers every page.
+    return Response(
+        content=_service_worker_source(),
+        media_type="application/javascript",
+        headers={"Cache-Control": "no-cache"},
+    )
@@ -1,14 +1,13 @@
 from pathlib import Path
-from uuid import uuid4
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 from .. import models, schemas, database
 from ..auth import get_current_user, verify_password, get_password_hash
+from ..storage import delete_if_unreferenced, get_storage, release_file, retain_file, store_file
 
 router = APIRouter(prefix = "/users", tags = ["Users"])
 
-PROFILE_UPLOAD_DIR = Path("static/uploads/profile")
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
 MAX_PROFILE_IMAGE_SIZE = 5 * 1024 * 1024
 
@@ -66,21 +65,16 @@ async def upload_profile_image(
             detail="Image too large. Maximum allowed size is 5MB",
         )
 
-    PROFILE_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    filename = f"user_{current_user.id}_{uuid4().hex}{extension}"
-    file_path = PROFILE_UPLOAD_DIR / filename
-    with open(file_path, "wb") as uploaded_file:
-        uploaded_file.write(content)
-
+    storage = get_storage()
     old_image = (current_user.profile_image or "").strip()
-    current_user.profile_image = f"/static/uploads/profile/{filename}"
+    new_image = store_file(db, storage, content, extension)
+    stale_key = release_file(db, storage, old_image)
+    current_user.profile_image = new_image
     db.commit()
     db.refresh(current_user)
 
-    if old_image.startswith("/static/uploads/profile/") and old_image != current_user.profile_image:
-        old_file = Path(old_image.lstrip("/"))
-        if old_file.is_file():
-            old_file.unlink()
+    if old_image != new_image:
+        delete_if_unreferenced(db, storage, stale_key)
 
     return current_user
 
@@ -107,11 +101,25 @@ def update_profile(update_data: schemas.UserUpdate, db: Session = Depends(databa
     if update_data.phone is not None:
         current_user.phone = update_data.phone.strip()
     
+    stale_key = None
     if update_data.profile_image is not None:
-        current_user.profile_image = update_data.profile_image.strip()
+        storage = get_storage()
+        new_image = update_data.profile_image.strip() or None
+        old_image = current_user.profile_image
+        if new_image != old_image:
+            if new_image is not None and not retain_file(db, storage, new_image):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Profile image must be an uploaded image",
+                )
+            stale_key = release_file(db, storage, old_image)
+            current_user.profile_image = new_image
     
     db.commit()
     db.refresh(current_user)
+
+    if stale_key is not None:
+        delete_if_unreferenced(db, get_storage(), stale_key)
     
     return current_user
 
@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, EmailStr
-from typing import Optional 
+from typing import Any, Optional 
 
 
 class UserCreate(BaseModel):
@@ -123,3 +123,58 @@ class TaskResponse(BaseModel):
 
 class TaskNotificationResponse(BaseModel):
     unread_count: int
+
+
+class TaskAssigneeStats(BaseModel):
+    assigned_to: int
+    assigned_to_name: Optional[str] = None
+    pending: int = 0
+    not_completed: int = 0
+    completed: int = 0
+    total: int = 0
+
+
+class TaskCompletionPoint(BaseModel):
+    day: date
+    total: int
+    completed: int
+    completion_rate: float
+
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    pending_total: int
+    overdue_total: int
+    completed_total: int
+    completion_rate: float
+    by_status: dict[str, int]
+    by_assignee: list[TaskAssigneeStats]
+    completion_over_time: list[TaskCompletionPoint]
+
+
+class ThrottledCount(BaseModel):
+    route: str
+    scope: str
+    count: int
+
+
+class AuditEventResponse(BaseModel):
+    id: int
+    actor_id: Optional[int] = None
+    actor_name: Optional[str] = None
+    action: str
+    target_type: str
+    target_id: Optional[int] = None
+    details: Optional[dict[str, Any]] = None
+    created_at: datetime
+
+
+class AuditLogPage(BaseModel):
+    events: list[AuditEventResponse]
+    next_before_id: Optional[int] = None
+
+
+class AuditLogStats(BaseModel):
+    queued: int
+    dropped: int
+    failed_flushes: int
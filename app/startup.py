@@ -0,0 +1,37 @@
+import logging
+
+from . import database, models
+from .rate_limit import get_backend, get_limits
+from .routes.page_routes import templates
+from .storage import get_storage
+from .task_stats import ensure_task_stats
+
+logger = logging.getLogger(__name__)
+
+
+def precompile_templates():
+    env = templates.env
+    for name in env.list_templates():
+        env.get_template(name)
+
+
+def warm_read_caches():
+    get_storage()
+    get_limits()
+    get_backend()
+
+    db = database.SessionLocal()
+    try:
+        if ensure_task_stats(db):
+            db.commit()
+    finally:
+        db.close()
+
+
+def warm_up():
+    """Everything a worker should do before it reports ready."""
+    models.Base.metadata.create_all(bind=database.engine)
+    database.prewarm_pool()
+    precompile_templates()
+    warm_read_caches()
+    logger.info("Warmup finished")
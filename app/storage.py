@@ -0,0 +1,315 @@
+import argparse
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import database, models
+
+PROFILE_URL_PREFIX = "/static/uploads/profile"
+GC_GRACE_PERIOD = timedelta(hours=1)
+
+
+class StorageBackend(ABC):
+    """Minimal blob store used for user uploads.
+
+    Keys are flat file names; ``url_prefix`` is what gets stored in the
+    database so the frontend can render the image directly.
+    """
+
+    url_prefix = ""
+
+    @abstractmethod
+    def put(self, key: str, content: bytes):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def list(self):
+        """Yield ``(key, modified_at)`` pairs for every stored object."""
+
+    def url(self, key: str):
+        return f"{self.url_prefix}/{key}"
+
+    def key_from_url(self, url: str | None):
+        value = (url or "").strip()
+        prefix = f"{self.url_prefix}/"
+        if not value.startswith(prefix):
+            return None
+        key = value[len(prefix):]
+        if not key or "/" in key or key.startswith("."):
+            return None
+        return key
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: Path, url_prefix: str):
+        self.root = Path(root)
+        self.url_prefix = url_prefix.rstrip("/")
+
+    def put(self, key: str, content: bytes):
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = self.root / f".{key}.{uuid4().hex}.tmp"
+        with open(temp_path, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, self.root / key)
+
+    def delete(self, key: str):
+        (self.root / key).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).is_file()
+
+    def list(self):
+        if not self.root.is_dir():
+            return
+        for path in self.root.iterdir():
+            if path.is_file():
+                modified_at = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+                yield path.name, modified_at
+
+
+class S3Storage(StorageBackend):
+    """S3-compatible backend.
+
+    ``client`` only needs ``put_object``, ``delete_object``, ``head_object``
+    and ``list_objects_v2`` with boto3's call signatures, so any local
+    stand-in implementing those works in place of a real bucket.
+    """
+
+    def __init__(self, client, bucket: str, url_prefix: str, key_prefix: str = "profile/"):
+        self.client = client
+        self.bucket = bucket
+        self.url_prefix = url_prefix.rstrip("/")
+        self.key_prefix = key_prefix
+
+    def put(self, key: str, content: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self.key_prefix + key, Body=content)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key_prefix + key)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key_prefix + key)
+        except Exception:
+            return False
+        return True
+
+    def list(self):
+        params = {"Bucket": self.bucket, "Prefix": self.key_prefix}
+        while True:
+            page = self.client.list_objects_v2(**params)
+            for item in page.get("Contents", []):
+                yield item["Key"][len(self.key_prefix):], item["LastModified"]
+            if not page.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = page["NextContinuationToken"]
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    backend = os.getenv("STORAGE_BACKEND", "local").lower()
+    if backend == "s3":
+        try:
+            import boto3
+        except ModuleNotFoundError as exc:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 to be installed") from exc
+
+        client = boto3.client("s3", endpoint_url=os.getenv("S3_ENDPOINT_URL"))
+        return S3Storage(
+            client,
+            bucket=os.environ["S3_BUCKET"],
+            url_prefix=os.environ["S3_PUBLIC_URL"],
+        )
+
+    return LocalStorage(Path("static/uploads/profile"), PROFILE_URL_PREFIX)
+
+
+def content_key(content: bytes, extension: str):
+    return f"{hashlib.sha256(content).hexdigest()}{extension.lower()}"
+
+
+def store_file(db: Session, storage: StorageBackend, content: bytes, extension: str):
+    """Store ``content`` once by hash and take a reference to it.
+
+    The reference is part of the caller's transaction; if it never commits
+    the blob is left unreferenced and the next garbage collection run
+    reclaims it.
+    """
+    key = content_key(content, extension)
+    stored = (
+        db.query(models.StoredFile)
+        .filter(models.StoredFile.key == key)
+        .with_for_update()
+        .first()
+    )
+    if stored is None:
+        storage.put(key, content)
+        try:
+            with db.begin_nested():
+                db.add(models.StoredFile(key=key, ref_count=1))
+        except IntegrityError:
+            stored = (
+                db.query(models.StoredFile)
+                .filter(models.StoredFile.key == key)
+                .with_for_update()
+                .one()
+            )
+            stored.ref_count += 1
+    else:
+        if not storage.exists(key):
+            storage.put(key, content)
+        stored.ref_count += 1
+    return storage.url(key)
+
+
+def retain_file(db: Session, storage: StorageBackend, url: str | None):
+    """Take a reference to an already stored file; returns False if unknown."""
+    key = storage.key_from_url(url)
+    if key is None:
+        return False
+    stored = (
+        db.query(models.StoredFile)
+        .filter(models.StoredFile.key == key)
+        .with_for_update()
+        .first()
+    )
+    if stored is None:
+        return False
+    stored.ref_count += 1
+    return True
+
+
+def release_file(db: Session, storage: StorageBackend, url: str | None):
+    """Drop one reference; returns the key if it may now be unreferenced."""
+    key = storage.key_from_url(url)
+    if key is None:
+        return None
+    stored = (
+        db.query(models.StoredFile)
+        .filter(models.StoredFile.key == key)
+        .with_for_update()
+        .first()
+    )
+    if stored is not None:
+        stored.ref_count = max(stored.ref_count - 1, 0)
+    return key
+
+
+def delete_if_unreferenced(db: Session, storage: StorageBackend, key: str | None):
+    """Delete a blob after commit once nothing points at it any more."""
+    if key is None:
+        return
+    url = storage.url(key)
+    stored = (
+        db.query(models.StoredFile)
+        .filter(models.StoredFile.key == key)
+        .with_for_update()
+        .first()
+    )
+    if stored is not None and stored.ref_count > 0:
+        db.rollback()
+        return
+    if db.query(models.User.id).filter(models.User.profile_image == url).first():
+        db.rollback()
+        return
+
+    if stored is not None:
+        db.delete(stored)
+    db.commit()
+    storage.delete(key)
+
+
+def collect_garbage(db: Session, storage: StorageBackend, grace: timedelta = GC_GRACE_PERIOD, dry_run: bool = False):
+    """Reclaim every stored blob that no user references.
+
+    Blobs younger than ``grace`` are kept so uploads whose transaction has
+    not committed yet are never collected. A dedup hit reuses an old blob
+    without rewriting it, so every candidate is re-checked under a row lock
+    right before it is deleted. Returns the reclaimed keys.
+    """
+    referenced = {
+        key
+        for (key,) in db.query(models.StoredFile.key).filter(models.StoredFile.ref_count > 0)
+    }
+    referenced.update(
+        storage.key_from_url(url)
+        for (url,) in db.query(models.User.profile_image).filter(models.User.profile_image.isnot(None)).distinct()
+    )
+
+    cutoff = datetime.now(timezone.utc) - grace
+    candidates = [
+        key
+        for key, modified_at in storage.list()
+        if key not in referenced and modified_at < cutoff
+    ]
+    if dry_run:
+        return candidates
+
+    reclaimed = []
+    for key in candidates:
+        stored = (
+            db.query(models.StoredFile)
+            .filter(models.StoredFile.key == key)
+            .with_for_update()
+            .first()
+        )
+        in_use = (stored is not None and stored.ref_count > 0) or (
+            db.query(models.User.id).filter(models.User.profile_image == storage.url(key)).first()
+            is not None
+        )
+        if in_use:
+            db.rollback()
+            continue
+        if stored is not None:
+            db.delete(stored)
+        db.commit()
+        storage.delete(key)
+        reclaimed.append(key)
+
+    db.query(models.StoredFile).filter(models.StoredFile.ref_count <= 0).delete(synchronize_session=False)
+    db.commit()
+    return reclaimed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload storage maintenance")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    gc_parser = subcommands.add_parser("gc", help="Delete unreferenced uploaded files")
+    gc_parser.add_argument("--grace-minutes", type=int, default=int(GC_GRACE_PERIOD.total_seconds() // 60))
+    gc_parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = database.SessionLocal()
+    try:
+        reclaimed = collect_garbage(
+            db,
+            get_storage(),
+            grace=timedelta(minutes=args.grace_minutes),
+            dry_run=args.dry_run,
+        )
+    finally:
+        db.close()
+
+    action = "Would delete" if args.dry_run else "Deleted"
+    print(f"{action} {len(reclaimed)} unreferenced file(s)")
+    for key in reclaimed:
+        print(key)
+
+
+if __name__ == "__main__":
+    main()
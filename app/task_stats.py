@@ -0,0 +1,105 @@
+from datetime import date
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+
+
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _bump(db: Session, model, key: dict, delta: int):
+    # Two transactions can be the first to touch the same key, so the row is
+    # created with an upsert rather than update-then-insert.
+    table = model.__table__
+    upsert_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert_insert is not None:
+        statement = upsert_insert(table).values(**key, count=delta)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(key),
+                set_={"count": table.c.count + delta},
+            )
+        )
+        return
+
+    updated = (
+        db.query(model)
+        .filter_by(**key)
+        .update({model.count: model.count + delta}, synchronize_session=False)
+    )
+    if updated:
+        return
+    try:
+        with db.begin_nested():
+            db.add(model(**key, count=delta))
+    except IntegrityError:
+        db.query(model).filter_by(**key).update(
+            {model.count: model.count + delta}, synchronize_session=False
+        )
+
+
+def rebuild_task_stats(db: Session):
+    db.query(models.TaskAssigneeStat).delete(synchronize_session=False)
+    db.query(models.TaskDailyStat).delete(synchronize_session=False)
+
+    assignee_rows = (
+        db.query(models.Task.assigned_to, models.Task.status, func.count(models.Task.id))
+        .group_by(models.Task.assigned_to, models.Task.status)
+        .all()
+    )
+    for assigned_to, task_status, count in assignee_rows:
+        db.add(models.TaskAssigneeStat(assigned_to=assigned_to, status=task_status, count=count))
+
+    created_on = func.date(models.Task.created_at)
+    daily_rows = (
+        db.query(created_on, models.Task.status, func.count(models.Task.id))
+        .group_by(created_on, models.Task.status)
+        .all()
+    )
+    for day, task_status, count in daily_rows:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        db.add(models.TaskDailyStat(day=day, status=task_status, count=count))
+
+    db.flush()
+
+
+def ensure_task_stats(db: Session):
+    """Build the summary tables with one GROUP BY pass if they are still cold.
+
+    Returns True when a rebuild happened, in which case the counts already
+    reflect every flushed task and callers must not apply their own delta.
+    If another transaction rebuilt the tables concurrently, ours is rolled
+    back to a savepoint and the tables are treated as already warm.
+    """
+    if db.query(models.TaskAssigneeStat.assigned_to).first() is not None:
+        return False
+    if db.query(models.Task.id).first() is None:
+        return False
+    try:
+        with db.begin_nested():
+            rebuild_task_stats(db)
+    except IntegrityError:
+        return False
+    return True
+
+
+def record_task_status_change(db: Session, task: models.Task, old_status: str | None):
+    """Apply a task's status transition to the summary tables.
+
+    Must run inside the same transaction as the task write, after a flush,
+    so the counts commit (or roll back) together with the task itself.
+    """
+    if ensure_task_stats(db) or old_status == task.status:
+        return
+
+    day = task.created_at.date()
+    if old_status is not None:
+        _bump(db, models.TaskAssigneeStat, {"assigned_to": task.assigned_to, "status": old_status}, -1)
+        _bump(db, models.TaskDailyStat, {"day": day, "status": old_status}, -1)
+    _bump(db, models.TaskAssigneeStat, {"assigned_to": task.assigned_to, "status": task.status}, 1)
+    _bump(db, models.TaskDailyStat, {"day": day, "status": task.status}, 1)
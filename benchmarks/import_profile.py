@@ -0,0 +1,59 @@
+"""Import-time profile of the application.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter
+and prints the slowest modules by cumulative import time. Importing
+``app.main`` must stay free of I/O; database and template work belongs in
+the startup warmup.
+
+Usage: python benchmarks/import_profile.py [--top N] [--module app.main]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_import(module: str):
+    env = dict(os.environ)
+    # create_engine never connects at import, so any URL will do here.
+    env.setdefault("DATABASE_URL", "sqlite://")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(result.returncode)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = profile_import(args.module)
+    total = next((cumulative for cumulative, _, name in rows if name.strip() == args.module), 0)
+
+    print(f"Import of {args.module}: {total / 1000:.1f} ms cumulative")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"{cumulative / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
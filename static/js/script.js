@@ -8,10 +8,113 @@ function getToken() {
 
 function setToken(token) {
     localStorage.setItem("token", token);
+    clearApiCache();
 }
 
 function removeToken() {
     localStorage.removeItem("token");
+    clearApiCache();
+}
+
+// =====================================
+// API DATA LAYER
+// =====================================
+
+const API_CACHE_PREFIX = "api-cache:";
+const inFlightRequests = new Map();
+
+function readApiCache(url) {
+    try {
+        const raw = sessionStorage.getItem(API_CACHE_PREFIX + url);
+        return raw ? JSON.parse(raw) : null;
+    } catch {
+        return null;
+    }
+}
+
+function writeApiCache(url, etag, data) {
+    try {
+        sessionStorage.setItem(
+            API_CACHE_PREFIX + url,
+            JSON.stringify({ etag, data })
+        );
+    } catch {
+        // Storage full or disabled: the request still succeeded.
+    }
+}
+
+function clearApiCache() {
+    invalidateApi("");
+}
+
+function invalidateApi(...prefixes) {
+    for (const url of [...inFlightRequests.keys()]) {
+        if (prefixes.some((prefix) => url.startsWith(prefix))) {
+            inFlightRequests.delete(url);
+        }
+    }
+
+    const keys = [];
+    for (let i = 0; i < sessionStorage.length; i++) {
+        const key = sessionStorage.key(i);
+        if (
+            key &&
+            key.startsWith(API_CACHE_PREFIX) &&
+            prefixes.some((prefix) =>
+                key.slice(API_CACHE_PREFIX.length).startsWith(prefix)
+            )
+        ) {
+            keys.push(key);
+        }
+    }
+    keys.forEach((key) => sessionStorage.removeItem(key));
+}
+
+// GET a JSON endpoint. Concurrent calls for the same URL share one request,
+// and cached responses are revalidated with If-None-Match.
+// Resolves to { ok, status, data }.
+function apiGet(url) {
+    if (inFlightRequests.has(url)) return inFlightRequests.get(url);
+
+    const request = (async () => {
+        const headers = {};
+        const token = getToken();
+        if (token) headers.Authorization = "Bearer " + token;
+
+        const cached = readApiCache(url);
+        if (cached?.etag) headers["If-None-Match"] = cached.etag;
+
+        const response = await fetch(url, { headers });
+        if (response.status === 304 && cached) {
+            return { ok: true, status: 200, data: cached.data };
+        }
+
+        let data = null;
+        try {
+            data = await response.json();
+        } catch {
+            data = null;
+        }
+
+        const etag = response.headers.get("ETag");
+        if (response.ok && etag) {
+            writeApiCache(url, etag, data);
+        } else if (!response.ok) {
+            invalidateApi(url);
+        }
+
+        return { ok: response.ok, status: response.status, data };
+    })();
+
+    inFlightRequests.set(url, request);
+    request
+        .finally(() => {
+            if (inFlightRequests.get(url) === request) {
+                inFlightRequests.delete(url);
+            }
+        })
+        .catch(() => {});
+    return request;
 }
 
 function toggleMenu() {
@@ -176,11 +279,7 @@ async function updateHeaderAuth() {
     if (!token) return;
 
     try {
-        const res = await fetch("/users/profile", {
-            headers: {
-                Authorization: "Bearer " + token,
-            },
-        });
+        const res = await apiGet("/users/profile");
 
         if (!res.ok) return;
 
@@ -264,14 +363,8 @@ async function loginUser(event) {
     setToken(data.access_token);
     showFlash("Login successful!", "success");
 
-    const profileRes = await fetch("/users/profile", {
-        headers: {
-            Authorization:
-                "Bearer " + data.access_token,
-        },
-    });
-
-    const profileData = await profileRes.json();
+    const profileRes = await apiGet("/users/profile");
+    const profileData = profileRes.data || {};
 
     setTimeout(() => {
         if (
@@ -298,10 +391,10 @@ async function loadTeam() {
     if (!presidentContainer) return;
 
     try {
-        const res = await fetch(
+        const res = await apiGet(
             "/users/team-data"
         );
-        const data = await res.json();
+        const data = res.data || {};
 
         const viceContainer =
             document.getElementById(
@@ -430,6 +523,18 @@ document.addEventListener(
     }
 );
 
+// =====================================
+// SERVICE WORKER
+// =====================================
+
+function registerServiceWorker() {
+    if (!("serviceWorker" in navigator)) return;
+
+    navigator.serviceWorker
+        .register("/sw.js")
+        .catch(() => console.log("Service worker registration failed"));
+}
+
 // =====================================
 // SINGLE DOM READY BLOCK
 // =====================================
@@ -441,5 +546,6 @@ document.addEventListener(
         ensureFontAwesome();
         ensureBottomNav();
         loadTeam();
+        registerServiceWorker();
     }
 );
\ No newline at end of file
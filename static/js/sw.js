@@ -0,0 +1,125 @@
+// =====================================
+// STATIC SHELL SERVICE WORKER
+// =====================================
+
+// Replaced by /sw.js with a hash of the deployed templates, CSS and JS, so
+// every deploy that changes them installs a fresh cache and drops the old one.
+const CACHE_VERSION = "__CACHE_VERSION__";
+const CACHE_NAME = `vytoverse-shell-${CACHE_VERSION}`;
+const UPLOADS_CACHE_NAME = `vytoverse-uploads-${CACHE_VERSION}`;
+const MAX_UPLOAD_ENTRIES = 200;
+
+const SHELL_ASSETS = [
+    "/",
+    "/static/css/style.css",
+    "/static/js/script.js",
+    "/static/images/logo.png",
+    "/static/images/founder.jpg",
+];
+
+const PAGE_PATHS = [
+    "/",
+    "/login",
+    "/signup",
+    "/team",
+    "/about",
+    "/admin",
+    "/contact",
+    "/library",
+    "/profile",
+    "/tasks",
+];
+
+self.addEventListener("install", (event) => {
+    event.waitUntil(
+        caches
+            .open(CACHE_NAME)
+            .then((cache) => cache.addAll(SHELL_ASSETS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener("activate", (event) => {
+    event.waitUntil(
+        caches
+            .keys()
+            .then((names) =>
+                Promise.all(
+                    names
+                        .filter(
+                            (name) =>
+                                name !== CACHE_NAME &&
+                                name !== UPLOADS_CACHE_NAME
+                        )
+                        .map((name) => caches.delete(name))
+                )
+            )
+            .then(() => self.clients.claim())
+    );
+});
+
+async function trimCache(cache, maxEntries) {
+    const keys = await cache.keys();
+    const excess = keys.length - maxEntries;
+    for (let i = 0; i < excess; i++) {
+        await cache.delete(keys[i]);
+    }
+}
+
+// Profile uploads are stored under their content hash, so a URL never
+// changes content and can be served straight from cache. The cache keeps
+// only the most recently added entries.
+async function cacheFirst(event) {
+    const cache = await caches.open(UPLOADS_CACHE_NAME);
+    const cached = await cache.match(event.request);
+    if (cached) return cached;
+
+    const response = await fetch(event.request);
+    if (response.ok) {
+        event.waitUntil(
+            cache
+                .put(event.request, response.clone())
+                .then(() => trimCache(cache, MAX_UPLOAD_ENTRIES))
+        );
+    }
+    return response;
+}
+
+// Pages, CSS, JS and site images are answered from cache immediately and refreshed in
+// the background so the next navigation picks up any deploy.
+async function staleWhileRevalidate(event) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(event.request);
+
+    const refresh = fetch(event.request)
+        .then((response) => {
+            if (response.ok) cache.put(event.request, response.clone());
+            return response;
+        })
+        .catch(() => cached);
+
+    if (cached) {
+        event.waitUntil(refresh);
+        return cached;
+    }
+    return refresh;
+}
+
+self.addEventListener("fetch", (event) => {
+    const request = event.request;
+    if (request.method !== "GET") return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (url.pathname.startsWith("/static/uploads/profile/")) {
+        event.respondWith(cacheFirst(event));
+    } else if (
+        PAGE_PATHS.includes(url.pathname) ||
+        url.pathname.startsWith("/static/images/") ||
+        url.pathname.startsWith("/static/css/") ||
+        url.pathname.startsWith("/static/js/")
+    ) {
+        event.respondWith(staleWhileRevalidate(event));
+    }
+});
@@ -0,0 +1,20 @@
+import os
+import tempfile
+
+import pytest
+
+_db_dir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'test.db')}")
+
+from app import database, models  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    models.Base.metadata.drop_all(bind=database.engine)
+    models.Base.metadata.create_all(bind=database.engine)
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from app import models
+from app.routes.admin_routes import _csv_export_value, _json_export_value, _tasks_export_query
+
+
+def test_task_export_filter_treats_wildcards_literally(db):
+    db.add(models.User(id=1, name="Asha", email="a@example.com", hashed_password="x", phone="1"))
+    db.add_all([
+        models.Task(title="Reach 50% signups", assigned_to=1, assigned_by=1),
+        models.Task(title="Reach 500 signups", assigned_to=1, assigned_by=1),
+        models.Task(title="rename a_b", assigned_to=1, assigned_by=1),
+        models.Task(title="rename axb", assigned_to=1, assigned_by=1),
+    ])
+    db.commit()
+
+    assert [row.title for row in _tasks_export_query(db, "50%")] == ["Reach 50% signups"]
+    assert [row.title for row in _tasks_export_query(db, "A_B")] == ["rename a_b"]
+    assert {row.assigned_to_name for row in _tasks_export_query(db, "asha")} == {"Asha"}
+
+
+def test_export_values():
+    moment = datetime(2026, 10, 19, 15, 44)
+    assert _json_export_value(moment) == "2026-10-19T15:44:00"
+    assert _csv_export_value(moment) == "2026-10-19T15:44:00"
+    assert _csv_export_value("=HYPERLINK(\"x\")") == "'=HYPERLINK(\"x\")"
+    assert _csv_export_value("@SUM(A1)") == "'@SUM(A1)"
+    assert _csv_export_value("-2+3") == "'-2+3"
+    assert _csv_export_value("plain") == "plain"
+    assert _csv_export_value(None) == ""
+    assert _csv_export_value(5) == 5
+
+
+def test_phone_numbers_are_not_formula_escaped():
+    assert _csv_export_value("+911") == "+911"
+    assert _csv_export_value("+91 98765 43210") == "+91 98765 43210"
+    assert _csv_export_value("+1 (555) 010-9999") == "+1 (555) 010-9999"
+    assert _csv_export_value("-42") == "-42"
+    assert _csv_export_value("+1+cmd") == "'+1+cmd"
@@ -0,0 +1,145 @@
+import threading
+import time
+
+from app import models
+from app.audit import AuditLog
+
+
+class RecordingAuditLog(AuditLog):
+    def __init__(self, failures=0, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+        self.failures = failures
+        self.written = threading.Event()
+
+    def _write(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append([event["target_id"] for event in batch])
+        self.written.set()
+
+
+def _record(log, count, start=0):
+    for target_id in range(start, start + count):
+        log.record(1, "task.assign", "task", target_id)
+
+
+def test_flushes_when_batch_size_is_reached():
+    log = RecordingAuditLog(batch_size=3, flush_interval=60)
+    log.start()
+    try:
+        _record(log, 3)
+        assert log.written.wait(2)
+    finally:
+        log._stop.set()
+        log._thread.join()
+
+    assert log.batches == [[0, 1, 2]]
+
+
+def test_flushes_partial_batch_on_interval():
+    log = RecordingAuditLog(batch_size=100, flush_interval=0.2)
+    log.start()
+    try:
+        _record(log, 2)
+        started = time.monotonic()
+        assert log.written.wait(2)
+        assert time.monotonic() - started >= 0.1
+    finally:
+        log._stop.set()
+        log._thread.join()
+
+    assert log.batches == [[0, 1]]
+
+
+def test_stop_drains_everything_still_queued():
+    log = RecordingAuditLog(batch_size=100, flush_interval=60)
+    _record(log, 5)
+
+    log.stop()
+
+    assert log.batches == [[0, 1, 2, 3, 4]]
+    assert log.stats() == {"queued": 0, "dropped": 0, "failed_flushes": 0}
+
+
+def test_failed_batch_is_retried_before_newer_events():
+    log = RecordingAuditLog(failures=1, batch_size=2, flush_interval=0.05)
+    log.start()
+    try:
+        _record(log, 2)
+        assert log.written.wait(2)
+        _record(log, 1, start=2)
+    finally:
+        log.stop()
+
+    assert log.batches[0] == [0, 1]
+    assert sum(log.batches, []) == [0, 1, 2]
+    assert log.stats()["failed_flushes"] == 1
+
+
+def test_full_queue_drops_and_counts_under_drop_policy():
+    log = RecordingAuditLog(queue_size=2, policy="drop")
+    _record(log, 3)
+
+    assert log.stats()["dropped"] == 1
+    assert log.stats()["queued"] == 2
+
+
+def test_full_queue_waits_then_drops_under_block_policy():
+    log = RecordingAuditLog(queue_size=1, policy="block", block_timeout=0.1)
+    _record(log, 1)
+
+    started = time.monotonic()
+    _record(log, 1, start=1)
+
+    assert time.monotonic() - started >= 0.1
+    assert log.stats() == {"queued": 1, "dropped": 1, "failed_flushes": 0}
+
+
+def test_block_policy_succeeds_once_space_frees_up():
+    log = RecordingAuditLog(queue_size=1, policy="block", block_timeout=2)
+    _record(log, 1)
+    threading.Timer(0.05, lambda: log._drain(1)).start()
+
+    _record(log, 1, start=1)
+
+    assert log.stats()["dropped"] == 0
+
+
+def test_stop_skips_drain_while_flusher_is_still_writing():
+    release = threading.Event()
+
+    class SlowAuditLog(RecordingAuditLog):
+        def _write(self, batch):
+            release.wait(5)
+            super()._write(batch)
+
+    log = SlowAuditLog(batch_size=1, flush_interval=60)
+    log.start()
+    _record(log, 1)
+    time.sleep(0.2)
+    _record(log, 1, start=1)
+
+    log.stop(timeout=0.05)
+    assert log.batches == []
+    assert log.stats()["queued"] == 1
+
+    release.set()
+    log._thread.join(2)
+    assert log.batches == [[0]]
+
+
+def test_events_are_written_with_one_multi_row_insert(db):
+    log = AuditLog(batch_size=10, flush_interval=60)
+    log.record(1, "library.delete", "library", 7, title="Notes")
+    log.record(1, "user.update", "user", 2, changes={"level": {"old": 1, "new": 2}})
+
+    log.stop()
+
+    events = db.query(models.AuditEvent).order_by(models.AuditEvent.id).all()
+    assert [(event.action, event.target_id) for event in events] == [
+        ("library.delete", 7),
+        ("user.update", 2),
+    ]
+    assert events[0].details == {"title": "Notes"}
@@ -0,0 +1,26 @@
+import asyncio
+from types import SimpleNamespace
+
+from app import main
+
+
+def test_warm_up_is_retried_until_it_succeeds(monkeypatch):
+    attempts = []
+
+    def flaky_warm_up():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("database unavailable")
+
+    started = []
+    monkeypatch.setattr(main, "warm_up", flaky_warm_up)
+    monkeypatch.setattr(main, "audit_log", SimpleNamespace(start=lambda: started.append(1)))
+    monkeypatch.setattr(main, "WARMUP_INITIAL_DELAY", 0)
+    app = SimpleNamespace(state=SimpleNamespace(ready=False, warmup_error=None))
+
+    asyncio.run(main._run_warm_up(app))
+
+    assert len(attempts) == 3
+    assert app.state.ready is True
+    assert app.state.warmup_error is None
+    assert started == [1]
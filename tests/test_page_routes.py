@@ -0,0 +1,26 @@
+from app.routes import page_routes
+from app.routes.page_routes import _service_worker_source
+
+
+def test_service_worker_cache_version_is_filled_in():
+    source = _service_worker_source()
+
+    assert "__CACHE_VERSION__" not in source
+    assert 'const CACHE_VERSION = "' in source
+
+
+def test_service_worker_version_changes_with_templates(tmp_path, monkeypatch):
+    for folder in ("static/css", "static/js", "templates"):
+        (tmp_path / folder).mkdir(parents=True)
+    (tmp_path / "static/js/sw.js").write_text('const CACHE_VERSION = "__CACHE_VERSION__";')
+    (tmp_path / "templates/index.html").write_text("<h1>v1</h1>")
+    monkeypatch.setattr(page_routes, "BASE_DIR", str(tmp_path))
+
+    _service_worker_source.cache_clear()
+    first = _service_worker_source()
+    (tmp_path / "templates/index.html").write_text("<h1>v2</h1>")
+    _service_worker_source.cache_clear()
+    second = _service_worker_source()
+    _service_worker_source.cache_clear()
+
+    assert first != second
@@ -0,0 +1,96 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app import rate_limit
+from app.rate_limit import InMemoryBackend, Limit, check_rate_limit, client_ip
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def _request(host="10.0.0.1", forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "headers": headers, "client": (host, 1234)})
+
+
+def test_bucket_allows_capacity_then_refills(clock):
+    backend = InMemoryBackend()
+    limit = Limit(capacity=2, period=10)
+
+    assert backend.take("k", limit) == 0
+    assert backend.take("k", limit) == 0
+    assert backend.take("k", limit) == pytest.approx(5)
+
+    clock.now += 5
+    assert backend.take("k", limit) == 0
+    assert backend.take("k", limit) > 0
+
+
+def test_buckets_are_independent_per_key(clock):
+    backend = InMemoryBackend()
+    limit = Limit(capacity=1, period=60)
+
+    assert backend.take("a", limit) == 0
+    assert backend.take("a", limit) > 0
+    assert backend.take("b", limit) == 0
+
+
+def test_idle_buckets_are_dropped_once_refilled(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "get_limits", lambda: {"login": {"ip": Limit(1, 60)}})
+    backend = InMemoryBackend()
+    limit = Limit(capacity=1, period=60)
+    backend.take("old", limit)
+    clock.now += 30
+    backend.take("middle", limit)
+    clock.now += 31
+    backend.take("recent", limit)
+
+    assert list(backend._buckets) == ["middle", "recent"]
+
+
+def test_bucket_count_is_capped_by_evicting_least_recently_used(clock, monkeypatch):
+    monkeypatch.setattr(InMemoryBackend, "MAX_BUCKETS", 3)
+    backend = InMemoryBackend()
+    limit = Limit(capacity=5, period=60)
+    for key in ["a", "b", "c"]:
+        backend.take(key, limit)
+    backend.take("a", limit)
+    backend.take("d", limit)
+
+    assert list(backend._buckets) == ["c", "a", "d"]
+
+
+def test_client_ip_uses_trusted_forwarded_hop():
+    request = _request(forwarded="6.6.6.6, 1.2.3.4, 10.0.0.9")
+
+    assert client_ip(request, trusted_hops=0) == "10.0.0.1"
+    assert client_ip(request, trusted_hops=1) == "10.0.0.9"
+    assert client_ip(request, trusted_hops=2) == "1.2.3.4"
+    assert client_ip(_request(), trusted_hops=1) == "10.0.0.1"
+
+
+def test_check_rate_limit_raises_429_and_counts(clock, monkeypatch):
+    backend = InMemoryBackend()
+    monkeypatch.setattr(rate_limit, "get_backend", lambda: backend)
+    monkeypatch.setattr(rate_limit, "get_limits", lambda: {"login": {"email": Limit(1, 60)}})
+
+    check_rate_limit(_request(), "login", email="A@example.com")
+    with pytest.raises(HTTPException) as excinfo:
+        check_rate_limit(_request("10.0.0.2"), "login", email="a@example.com ")
+
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers["Retry-After"] == "60"
+    assert rate_limit.throttled_counts() == [{"route": "login", "scope": "email", "count": 1}]
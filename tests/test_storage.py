@@ -0,0 +1,148 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import models
+from app.storage import (
+    LocalStorage,
+    S3Storage,
+    StorageBackend,
+    collect_garbage,
+    content_key,
+    delete_if_unreferenced,
+    release_file,
+    store_file,
+)
+
+
+class FakeS3Client:
+    """In-memory stand-in for the subset of the boto3 S3 client we use."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[(Bucket, Key)] = (Body, datetime.now(timezone.utc))
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise KeyError(Key)
+        return {}
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + 2]
+        result = {
+            "Contents": [
+                {"Key": key, "LastModified": self.objects[(Bucket, key)][1]} for key in page
+            ],
+            "IsTruncated": start + 2 < len(keys),
+        }
+        if result["IsTruncated"]:
+            result["NextContinuationToken"] = str(start + 2)
+        return result
+
+    def age(self, seconds):
+        for key, (body, modified_at) in self.objects.items():
+            self.objects[key] = (body, modified_at - timedelta(seconds=seconds))
+
+
+def _age_local(storage, seconds):
+    for key, _ in list(storage.list()):
+        path = storage.root / key
+        stamp = path.stat().st_mtime - seconds
+        os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture(params=["local", "s3"])
+def storage(request, tmp_path):
+    if request.param == "local":
+        backend = LocalStorage(tmp_path / "profile", "/static/uploads/profile")
+        backend.age = lambda seconds: _age_local(backend, seconds)
+    else:
+        client = FakeS3Client()
+        backend = S3Storage(client, "bucket", "https://cdn.example.com/profile")
+        backend.age = client.age
+    return backend
+
+
+def _user(db, user_id):
+    user = models.User(id=user_id, name=f"u{user_id}", email=f"u{user_id}@example.com", hashed_password="x", phone="1")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+
+def test_identical_content_is_stored_once(db, storage):
+    first, second = _user(db, 1), _user(db, 2)
+
+    first.profile_image = store_file(db, storage, b"same", ".png")
+    second.profile_image = store_file(db, storage, b"same", ".png")
+    db.commit()
+
+    assert first.profile_image == second.profile_image
+    assert [key for key, _ in storage.list()] == [content_key(b"same", ".png")]
+    assert db.query(models.StoredFile).one().ref_count == 2
+
+
+def test_blob_is_deleted_with_its_last_reference(db, storage):
+    first, second = _user(db, 1), _user(db, 2)
+    url = store_file(db, storage, b"same", ".png")
+    store_file(db, storage, b"same", ".png")
+    first.profile_image = second.profile_image = url
+    db.commit()
+    key = storage.key_from_url(url)
+
+    stale = release_file(db, storage, first.profile_image)
+    first.profile_image = None
+    db.commit()
+    delete_if_unreferenced(db, storage, stale)
+    assert storage.exists(key)
+
+    stale = release_file(db, storage, second.profile_image)
+    second.profile_image = None
+    db.commit()
+    delete_if_unreferenced(db, storage, stale)
+    assert not storage.exists(key)
+    assert db.query(models.StoredFile).count() == 0
+
+
+def test_gc_reclaims_only_old_unreferenced_blobs(db, storage):
+    user = _user(db, 1)
+    user.profile_image = store_file(db, storage, b"kept", ".png")
+    db.commit()
+    storage.put("orphan.png", b"orphan")
+    storage.age(7200)
+    storage.put("fresh.png", b"fresh")
+
+    assert collect_garbage(db, storage, dry_run=True) == ["orphan.png"]
+    assert collect_garbage(db, storage) == ["orphan.png"]
+    assert sorted(key for key, _ in storage.list()) == sorted(
+        ["fresh.png", storage.key_from_url(user.profile_image)]
+    )
+
+
+def test_gc_skips_blob_reused_by_dedup(db, storage):
+    user = _user(db, 1)
+    url = store_file(db, storage, b"image", ".png")
+    db.commit()
+    release_file(db, storage, url)
+    db.commit()
+    storage.age(7200)
+
+    # A later upload of the same bytes reuses the old blob without rewriting it.
+    user.profile_image = store_file(db, storage, b"image", ".png")
+    db.commit()
+
+    assert collect_garbage(db, storage) == []
+    assert storage.exists(storage.key_from_url(url))
@@ -0,0 +1,53 @@
+from app import models
+from app.task_stats import ensure_task_stats, record_task_status_change
+
+
+def _counts(db, model):
+    return {
+        (row.assigned_to if model is models.TaskAssigneeStat else row.day, row.status): row.count
+        for row in db.query(model).all()
+    }
+
+
+def _add_task(db, assigned_to, status="pending"):
+    task = models.Task(title="t", status=status, assigned_to=assigned_to, assigned_by=1)
+    db.add(task)
+    db.flush()
+    return task
+
+
+def test_cold_tables_are_rebuilt_with_the_new_task_included(db):
+    _add_task(db, 1)
+    db.commit()
+
+    task = _add_task(db, 2, "completed")
+    record_task_status_change(db, task, None)
+    db.commit()
+
+    assert _counts(db, models.TaskAssigneeStat) == {(1, "pending"): 1, (2, "completed"): 1}
+
+
+def test_status_changes_move_counts_between_rows(db):
+    first = _add_task(db, 1)
+    record_task_status_change(db, first, None)
+    second = _add_task(db, 1)
+    record_task_status_change(db, second, None)
+    db.commit()
+
+    second.status = "completed"
+    db.flush()
+    record_task_status_change(db, second, "pending")
+    db.commit()
+
+    assert _counts(db, models.TaskAssigneeStat) == {(1, "pending"): 1, (1, "completed"): 1}
+    daily = _counts(db, models.TaskDailyStat)
+    assert sorted(daily.values()) == [1, 1]
+
+
+def test_ensure_is_a_no_op_when_warm_or_empty(db):
+    assert ensure_task_stats(db) is False
+
+    task = _add_task(db, 1)
+    assert ensure_task_stats(db) is True
+    assert ensure_task_stats(db) is False
+    assert _counts(db, models.TaskAssigneeStat) == {(task.assigned_to, "pending"): 1}